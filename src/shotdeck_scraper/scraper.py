@@ -5,36 +5,84 @@ Scrape stills + metadata from Shotdeck after logging in with your own account.
 See README.md for setup and usage.
 """
 
-import os, time, json, argparse, re
+import os, time, json, argparse, re, pickle, tempfile
+import asyncio
+import multiprocessing
+from bisect import bisect_left
+from math import gcd
+from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import urljoin
+import numpy as np
 import pandas as pd
-import requests
+import httpx
+import lxml.html
 from dotenv import load_dotenv
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
 from selenium.webdriver.common.by import By
 from selenium.webdriver import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, StaleElementReferenceException
 
+# Pillow is optional; without it image dimensions are left empty
+try:
+    from PIL import Image
+    _HAS_PIL = True
+except ImportError:
+    _HAS_PIL = False
+
 # ---------- Config ----------
 BASE = "https://shotdeck.com"
 LOGIN_URL = f"{BASE}/welcome/login"
+SHOT_DETAILS_URL = f"{BASE}/shots/{{shot_id}}"
+SESSION_FILE = Path.home() / ".shotdeck_session.json"
+
+_NEWLINES = re.compile(r"\s+\n\s+|\n")
+_WS = re.compile(r"\s+")
+_NORM = re.compile(r"[\s/]+")
+_BGCOLOR = re.compile(r"background-color:\s*([^;]+);?")
+
+# Common cinema aspect ratios
+CINEMA_STANDARDS = {
+    1.00: "1:1",     # Square
+    1.33: "4:3",     # Academy ratio
+    1.66: "5:3",     # European widescreen
+    1.78: "16:9",    # Widescreen TV
+    1.85: "1.85:1",  # Flat
+    2.35: "2.35:1",  # Anamorphic
+    2.39: "2.39:1",  # CinemaScope
+}
+_CINEMA_KEYS = tuple(sorted(CINEMA_STANDARDS))
+_CINEMA_KEYS_ARR = np.array(_CINEMA_KEYS)
+_CINEMA_LABELS_ARR = np.array([CINEMA_STANDARDS[k] for k in _CINEMA_KEYS])
+
+# Page helpers installed by setup_driver on every new document
+_TILE_HELPERS_JS = """
+    window.__shotdeckTileCount = () => document.querySelectorAll('#stills .outerimage').length;
+    window.__shotdeckTilesHtml = start => Array.from(document.querySelectorAll('#stills .outerimage'))
+        .slice(start).map(t => t.outerHTML).join('');
+"""
 
-# Global counter for processed items
-processed_shots = set()
+# Shot ids (see shot_key) whose rows are in the progress file, including from earlier runs
+processed_shots: set[int | str] = set()
 
 def setup_driver(headless=False):
     opts = Options()
+    # Return from driver.get() at DOMContentLoaded; the gallery waits below poll for what we need
+    opts.page_load_strategy = "eager"
     if headless:
         opts.add_argument("--headless=new")
     opts.add_argument("--start-maximized")
     opts.add_argument("--disable-blink-features=AutomationControlled")
     opts.add_experimental_option("excludeSwitches", ["enable-automation"])
     opts.add_experimental_option('useAutomationExtension', False)
+    # Don't fetch image bytes in the browser; thumbnails keep their src attributes
+    # and full images are downloaded over HTTP
+    opts.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     opts.add_argument("--window-size=1920,1080")
     driver = webdriver.Chrome(options=opts)
     driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
@@ -42,8 +90,42 @@ def setup_driver(headless=False):
             Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
         """
     })
+    # Compiled once per document, so each scroll only sends a short call
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _TILE_HELPERS_JS})
     return driver
 
+class _AttachedDriver(webdriver.Remote):
+    """Remote driver bound to an existing chromedriver session instead of starting a new one"""
+
+    def __init__(self, executor_url, session_id):
+        self._existing_session_id = session_id
+        super().__init__(command_executor=ChromeRemoteConnection(executor_url), options=Options())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        self.session_id = self._existing_session_id
+        self.caps = {}
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+def save_session(driver, path=SESSION_FILE):
+    """Remember the chromedriver URL and session id so a later run can reattach"""
+    with open(path, "w") as f:
+        json.dump({"executor_url": driver.service.service_url, "session_id": driver.session_id}, f)
+    # Leave chromedriver (and the logged-in browser) running when this process exits
+    driver.service.process = None
+
+def attach_session(path=SESSION_FILE):
+    """Reattach to a session saved by save_session; returns None if there is none or it is gone"""
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        driver = _AttachedDriver(saved["executor_url"], saved["session_id"])
+        _ = driver.current_url  # raises if the browser or session no longer exists
+        return driver
+    except Exception:
+        return None
+
 def human_pause(a=0.3, b=0.9):
     time.sleep(a + (b-a)*0.5)
 
@@ -57,14 +139,38 @@ def selenium_login(driver, email, password):
     wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
     human_pause()
 
-def copy_cookies_to_requests(driver):
-    session = requests.Session()
+def is_logged_out(driver):
+    """True if Shotdeck sent us to the login page, e.g. because a reused session expired"""
+    return "/welcome/login" in driver.current_url or bool(driver.find_elements(By.NAME, "pass"))
+
+def copy_cookies_to_client(driver, max_connections=64):
+    """Build an HTTP/2 client carrying the browser's login cookies
+
+    One client is shared by all downloads so connections (and TLS handshakes)
+    are reused, with requests multiplexed over them.
+    """
+    cookies = httpx.Cookies()
     for c in driver.get_cookies():
-        session.cookies.set(c['name'], c['value'], domain=c.get('domain'))
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0"
-    })
-    return session
+        cookies.set(c['name'], c['value'], domain=c.get('domain', ''))
+    return httpx.Client(
+        http2=True,
+        cookies=cookies,
+        headers={"User-Agent": "Mozilla/5.0"},
+        timeout=60,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 2),
+    )
+
+def async_client_like(client, max_connections=64):
+    """Async counterpart of `client` (same cookies and headers) for the image downloads"""
+    return httpx.AsyncClient(
+        http2=True,
+        cookies=client.cookies,
+        headers=client.headers,
+        timeout=client.timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 2),
+    )
 
 def wait_for_gallery(driver, timeout=40, max_retries=3):
     retries = 0
@@ -80,20 +186,34 @@ def wait_for_gallery(driver, timeout=40, max_retries=3):
             if retries < max_retries:
                 time.sleep(5)
                 driver.refresh()
-                time.sleep(3)
             else:
                 raise TimeoutException(f"Failed to load gallery after {max_retries} retries")
     return False
 
 def get_text(e):
-    return re.sub(r"\s+", " ", e.text.strip())
+    return _WS.sub(" ", e.text.strip())
+
+def get_node_text(node):
+    return _WS.sub(" ", node.text_content().strip())
 
 def normalize_field_name(label):
     label = label.strip().rstrip(":")
-    label = re.sub(r"[\s/]+", "_", label.lower())
+    label = _NORM.sub("_", label.lower())
     label = label.replace("-", "_")
     return label
 
+def cdp_click(driver, element):
+    """Click the centre of an element with raw CDP mouse events"""
+    # Input.dispatchMouseEvent takes viewport coordinates; element.rect is relative to the document
+    x, y = driver.execute_script("""
+        const r = arguments[0].getBoundingClientRect();
+        return [r.left + r.width / 2, r.top + r.height / 2];
+    """, element)
+    for event_type in ("mousePressed", "mouseReleased"):
+        driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
+            "type": event_type, "x": x, "y": y, "button": "left", "clickCount": 1
+        })
+
 def safe_click_element(driver, element, max_attempts=3):
     """Safely click an element with multiple fallback strategies"""
     for attempt in range(max_attempts):
@@ -120,9 +240,9 @@ def safe_click_element(driver, element, max_attempts=3):
             except Exception:
                 pass
                 
-            # Try ActionChains
+            # Try a native mouse click through CDP
             try:
-                ActionChains(driver).move_to_element(element).click().perform()
+                cdp_click(driver, element)
                 return True
             except Exception:
                 pass
@@ -182,7 +302,7 @@ def parse_modal(driver):
 
     try:
         swatches = driver.find_elements(By.CSS_SELECTOR, ".palette a[style*='background-color']")
-        data["palette_hex"] = ",".join([re.search(r'background-color:\s*([^;]+);?', a.get_attribute("style")).group(1)
+        data["palette_hex"] = ",".join([_BGCOLOR.search(a.get_attribute("style")).group(1)
                                         for a in swatches if a.get_attribute("style")])
     except Exception:
         data["palette_hex"] = ""
@@ -220,41 +340,105 @@ def parse_modal(driver):
     data["image_url"] = img_url
     return data
 
+def parse_shot_details(tree):
+    """Parse shot details from the modal HTML (same fields as parse_modal)"""
+    data = {}
+
+    title_hdr = tree.cssselect("#shotModalTitle")
+    data["title_year_raw"] = get_node_text(title_hdr[0]) if title_hdr else ""
+
+    colors = []
+    for a in tree.cssselect(".palette a[style*='background-color']"):
+        m = _BGCOLOR.search(a.get("style", ""))
+        if m:
+            colors.append(m.group(1))
+    data["palette_hex"] = ",".join(colors)
+
+    for g in tree.cssselect("#shot_details .detail-group"):
+        try:
+            label = normalize_field_name(get_node_text(g.cssselect(".detail-type")[0]))
+            details_div = g.cssselect(".details")[0]
+            spans = details_div.cssselect("span.full_location, span.full_filming_location")
+            full = get_node_text(spans[0]) if spans else None
+            if full:
+                value = full
+            else:
+                anchors = details_div.cssselect("a")
+                if anchors:
+                    value = ", ".join([get_node_text(a) for a in anchors])
+                else:
+                    value = get_node_text(details_div)
+            data[label] = value
+        except Exception:
+            continue
+
+    hero = tree.cssselect("#hero a")
+    if hero and hero[0].get("href"):
+        img_url = hero[0].get("href")
+    else:
+        img = tree.cssselect("#shot_details_hero")
+        img_url = img[0].get("src", "") if img else ""
+    data["image_url"] = urljoin(BASE, img_url) if img_url else ""
+    return data
+
+async def fetch_shot_details(client, shot_id):
+    """Fetch and parse a shot's modal content over HTTP instead of through Selenium"""
+    r = await client.get(SHOT_DETAILS_URL.format(shot_id=shot_id), headers={"X-Requested-With": "XMLHttpRequest"})
+    r.raise_for_status()
+    return parse_shot_details(lxml.html.fromstring(r.content))
+
+async def fetch_details(client, shot_ids, max_concurrent=16):
+    """Fetch details for a batch of shots concurrently; failed fetches come back as exceptions"""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def fetch(shot_id):
+        async with semaphore:
+            return await fetch_shot_details(client, shot_id)
+
+    return await asyncio.gather(*(fetch(shot_id) for shot_id in shot_ids), return_exceptions=True)
+
 def parse_tile_basic(tile):
     d = {}
-    d["shot_id"] = tile.get_attribute("data-shotid") or ""
-    d["titleyear"] = tile.get_attribute("data-titleyear") or ""
-    d["shot_status"] = tile.get_attribute("data-shot-status") or ""
-    d["title_content_status"] = tile.get_attribute("data-title-content-status") or ""
-    try:
-        title_el = tile.find_element(By.CSS_SELECTOR, ".moviedetails.topdetails .gallerytitle")
-        d["grid_title_raw"] = get_text(title_el)
-    except Exception:
-        d["grid_title_raw"] = ""
-    try:
-        thumb = tile.find_element(By.CSS_SELECTOR, "a.gallerythumb img.still")
-        d["thumb_src"] = thumb.get_attribute("src")
-    except Exception:
-        d["thumb_src"] = ""
-    try:
-        d["data_filename"] = tile.find_element(By.CSS_SELECTOR, "a.gallerythumb").get_attribute("data-filename")
-    except Exception:
-        d["data_filename"] = ""
+    d["shot_id"] = tile.get("data-shotid") or ""
+    d["titleyear"] = tile.get("data-titleyear") or ""
+    d["shot_status"] = tile.get("data-shot-status") or ""
+    d["title_content_status"] = tile.get("data-title-content-status") or ""
+    title_el = tile.cssselect(".moviedetails.topdetails .gallerytitle")
+    d["grid_title_raw"] = get_node_text(title_el[0]) if title_el else ""
+    thumb = tile.cssselect("a.gallerythumb img.still")
+    src = thumb[0].get("src") if thumb else ""
+    d["thumb_src"] = urljoin(BASE, src) if src else ""
+    a = tile.cssselect("a.gallerythumb")
+    d["data_filename"] = (a[0].get("data-filename") if a else "") or ""
     return d
 
+def harvest_tiles(driver, start=0):
+    """Parse gallery tiles from index `start` on, fetching their HTML in a single script call"""
+    html = driver.execute_script("return window.__shotdeckTilesHtml(arguments[0])", start)
+    if not html:
+        return []
+    tree = lxml.html.fragment_fromstring(html, create_parent="div")
+    return [parse_tile_basic(tile) for tile in tree.cssselect(".outerimage")]
+
+def find_tile(driver, shot_id):
+    return driver.find_element(By.CSS_SELECTOR, f'#stills .outerimage[data-shotid="{shot_id}"]')
+
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
 def calculate_image_metadata(width, height):
-    """Calculate image dimensions metadata with new column names"""
+    """Calculate image dimensions metadata for one image, keyed by the new column names
+
+    The scraper itself uses calculate_image_metadata_batch; this scalar version is
+    the reference the batch version is tested against.
+    """
     if width <= 0 or height <= 0:
-        return "", "", ""
-    
-    # Calculate greatest common divisor
-    def gcd(a, b):
-        while b:
-            a, b = b, a % b
-        return a
+        return {
+            "image_width": width,
+            "image_height": height,
+            "image_aspect_ratio_fraction": "",
+            "image_aspect_ratio_cinema": "",
+        }
     
     # Get simplified ratio for image_aspect_ratio_fraction
     divisor = gcd(width, height)
@@ -265,175 +449,345 @@ def calculate_image_metadata(width, height):
     # Calculate normalized cinema aspect ratio for image_aspect_ratio_cinema
     ratio = width / height
     
-    # Common cinema aspect ratios with tolerance
-    cinema_standards = {
-        2.39: "2.39:1",  # CinemaScope
-        2.35: "2.35:1",  # Anamorphic
-        1.85: "1.85:1",  # Flat
-        1.78: "16:9",    # Widescreen TV
-        1.66: "5:3",     # European widescreen
-        1.33: "4:3",     # Academy ratio
-        1.00: "1:1",     # Square
-    }
-    
-    # Find closest standard ratio
-    closest_ratio = min(cinema_standards.keys(), key=lambda x: abs(x - ratio))
+    # Find closest standard ratio: only the neighbours around the insertion point can be closest
+    i = bisect_left(_CINEMA_KEYS, ratio)
+    candidates = _CINEMA_KEYS[max(i - 1, 0):i + 1]
+    closest_ratio = min(candidates, key=lambda x: abs(x - ratio))
     
     # Use if within reasonable tolerance (5%)
     if abs(ratio - closest_ratio) / closest_ratio < 0.05:
-        image_aspect_ratio_cinema = cinema_standards[closest_ratio]
+        image_aspect_ratio_cinema = CINEMA_STANDARDS[closest_ratio]
     else:
         # Round to 2 decimal places for non-standard ratios
         rounded_ratio = round(ratio, 2)
         image_aspect_ratio_cinema = f"{rounded_ratio:.2f}:1"
     
-    return image_aspect_ratio_fraction, image_aspect_ratio_cinema
+    return {
+        "image_width": width,
+        "image_height": height,
+        "image_aspect_ratio_fraction": image_aspect_ratio_fraction,
+        "image_aspect_ratio_cinema": image_aspect_ratio_cinema,
+    }
 
-def save_image(session, url, out_dir: Path, shot_id: str, fallback_ext=".jpg"):
+def calculate_image_metadata_batch(widths, heights):
+    """Vectorised calculate_image_metadata: returns (fraction, cinema) string arrays
+
+    Entries where either dimension is missing or non-positive are left empty.
+    """
+    w = np.asarray(widths, dtype=np.int64)
+    h = np.asarray(heights, dtype=np.int64)
+    valid = (w > 0) & (h > 0)
+    w = np.where(valid, w, 1)
+    h = np.where(valid, h, 1)
+
+    divisor = np.gcd(w, h)
+    fraction = np.char.add(np.char.add((w // divisor).astype(str), ":"), (h // divisor).astype(str))
+
+    # Closest standard ratio: compare the neighbours on either side of the insertion point
+    ratio = w / h
+    i = np.searchsorted(_CINEMA_KEYS_ARR, ratio)
+    lo = np.clip(i - 1, 0, len(_CINEMA_KEYS_ARR) - 1)
+    hi = np.clip(i, 0, len(_CINEMA_KEYS_ARR) - 1)
+    closest = np.where(np.abs(ratio - _CINEMA_KEYS_ARR[lo]) <= np.abs(ratio - _CINEMA_KEYS_ARR[hi]), lo, hi)
+    closest_ratio = _CINEMA_KEYS_ARR[closest]
+
+    # Use the standard name if within 5%, otherwise the ratio to 2 decimal places
+    is_standard = np.abs(ratio - closest_ratio) / closest_ratio < 0.05
+    cinema = np.where(is_standard, _CINEMA_LABELS_ARR[closest], np.char.mod("%.2f:1", ratio))
+
+    return np.where(valid, fraction, ""), np.where(valid, cinema, "")
+
+@dataclass(slots=True)
+class ImageMeta:
+    """Result of save_image; empty strings when the image or its dimensions are unavailable"""
+    path: str = ""
+    width: str = ""
+    height: str = ""
+
+def read_image_size(path):
+    # Image.open only reads the header, so this doesn't decode the pixels
+    with Image.open(path) as img:
+        return img.size
+
+def is_saved_image(path):
+    return path.exists() and path.stat().st_size > 0
+
+def open_part_file(out_path):
+    """Open a temporary file next to `out_path`, unique per writer since overlapping shards can fetch the same shot"""
+    fd, part_path = tempfile.mkstemp(dir=out_path.parent, prefix=out_path.name + ".", suffix=".part")
+    return os.fdopen(fd, "wb"), Path(part_path)
+
+def finish_part_file(part_path, out_path):
+    try:
+        os.replace(part_path, out_path)
+    except OSError:
+        part_path.unlink(missing_ok=True)
+        # Fine if another process saved the same shot first
+        if not is_saved_image(out_path):
+            raise
+
+async def save_image(client, url, out_dir: Path, shot_id: str, fallback_ext=".jpg"):
+    """Download one image and read its dimensions
+
+    Opening, renaming and Pillow calls run in worker threads so a slow disk doesn't
+    stall the other downloads sharing the event loop. Chunks are written inline;
+    they only go to the page cache, and a thread hop per chunk would cost more.
+    """
     if not url:
-        return "", "", "", "", ""
-    ensure_dir(out_dir)
+        return ImageMeta()
     ext = os.path.splitext(url.split("?")[0])[1].lower() or fallback_ext
     if ext not in [".jpg", ".jpeg", ".png", ".webp"]:
         ext = fallback_ext
     out_path = out_dir / f"{shot_id}{ext}"
     try:
-        r = session.get(url, timeout=60)
-        r.raise_for_status()
-        with open(out_path, "wb") as f:
-            f.write(r.content)
+        await asyncio.to_thread(ensure_dir, out_dir)
+        # Reuse images saved by an earlier (possibly interrupted) run
+        if not await asyncio.to_thread(is_saved_image, out_path):
+            # Stream straight to disk instead of holding the whole image in memory; write to a
+            # temporary name first so an interrupted download is never mistaken for a saved image
+            f, part_path = await asyncio.to_thread(open_part_file, out_path)
+            try:
+                try:
+                    async with client.stream("GET", url) as r:
+                        r.raise_for_status()
+                        async for chunk in r.aiter_bytes(65536):
+                            f.write(chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+            except BaseException:
+                await asyncio.to_thread(part_path.unlink, missing_ok=True)
+                raise
+            await asyncio.to_thread(finish_part_file, part_path, out_path)
         
         # Get image dimensions using PIL if available
+        if not _HAS_PIL:
+            print("PIL/Pillow not installed. Cannot calculate image dimensions.")
+            return ImageMeta(path=str(out_path))
         try:
-            from PIL import Image
-            import io
-            
-            # Open image from bytes to avoid file I/O issues
-            img = Image.open(io.BytesIO(r.content))
-            image_width = str(img.width)
-            image_height = str(img.height)
+            width, height = await asyncio.to_thread(read_image_size, out_path)
             
-            # Calculate aspect ratios with new names
-            image_aspect_ratio_fraction, image_aspect_ratio_cinema = calculate_image_metadata(img.width, img.height)
+            # Aspect ratios are computed for all rows at once in save_progress
+            return ImageMeta(path=str(out_path), width=str(width), height=str(height))
             
-            return str(out_path), image_width, image_height, image_aspect_ratio_fraction, image_aspect_ratio_cinema
-            
-        except ImportError:
-            print("PIL/Pillow not installed. Cannot calculate image dimensions.")
-            return str(out_path), "", "", "", ""
         except Exception as e:
             print(f"Error calculating image dimensions: {e}")
-            return str(out_path), "", "", "", ""
+            return ImageMeta(path=str(out_path))
             
     except Exception:
-        return "", "", "", "", ""
-
-def incremental_scrape(driver, session, max_shots, img_dir, batch_size=20, scroll_pause=1.0):
-    """Incrementally scrape items as we scroll down"""
+        return ImageMeta()
+
+async def download_images(client, pending, img_dir, max_concurrent=16):
+    """Download the images for a batch of records concurrently and fill in their image fields"""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def download(shot_id, image_url):
+        async with semaphore:
+            return await save_image(client, image_url, img_dir, shot_id)
+
+    metas = await asyncio.gather(*(download(shot_id, image_url) for shot_id, image_url, _ in pending))
+    for (_, _, record), meta in zip(pending, metas, strict=True):
+        # New columns with different names
+        record.update({
+            "image_path": meta.path,
+            "image_width": meta.width,
+            "image_height": meta.height,
+        })
+    return [record for _, _, record in pending]
+
+def count_tiles(driver):
+    return driver.execute_script("return window.__shotdeckTileCount()")
+
+def shot_key(shot_id):
+    """Normalize a shot id for processed_shots; numeric ids become ints, anything else stays a string"""
+    shot_id = str(shot_id).strip()
+    return int(shot_id) if shot_id.isdigit() else shot_id
+
+def load_processed(path):
+    """Load the shot ids finished by earlier runs (empty set if there are none)"""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return set()
+
+def save_processed(shots, path):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(shots, f)
+    os.replace(tmp_path, path)
+
+def incremental_scrape(driver, client, max_shots, img_dir, progress_path, batch_size=20, scroll_timeout=10,
+                       parallel_downloads=16, processed_path=None):
+    """Incrementally scrape items as we scroll down, appending each batch to `progress_path`
+
+    Returns the number of shots processed.
+    """
     global processed_shots
-    rows = []
-    all_fields = set()
-    last_height = driver.execute_script("return document.body.scrollHeight")
+    unsaved = []
+    # Shots taken this run; they only join processed_shots once their rows are saved
+    queued = set()
     processed_count = 0
-    consecutive_no_new = 0
-    max_consecutive_no_new = 3
+    # The gallery only appends tiles as it scrolls, so each sweep starts where the last one ended
+    seen_tiles = 0
     
     print(f"Starting incremental scrape for up to {max_shots} shots...")
     
-    while processed_count < max_shots:
-        # Get current visible tiles
-        try:
-            tiles = driver.find_elements(By.CSS_SELECTOR, "#stills .outerimage")
-            current_tile_count = len(tiles)
-            print(f"Visible tiles: {current_tile_count}, Processed: {processed_count}/{max_shots}")
+    # Selenium stays synchronous; the detail fetches and image downloads run on this event loop
+    loop = asyncio.new_event_loop()
+    async_client = async_client_like(client, max_connections=parallel_downloads)
+    try:
+        while processed_count < max_shots:
+            # Get current visible tiles
+            try:
+                tiles = harvest_tiles(driver, seen_tiles)
+                seen_tiles += len(tiles)
+                print(f"Visible tiles: {seen_tiles} ({len(tiles)} new), Processed: {processed_count}/{max_shots}")
             
-            # Process tiles in batches
-            new_tiles_processed = 0
-            for tile in tiles:
-                if processed_count >= max_shots:
-                    break
-                    
-                try:
-                    basic_info = parse_tile_basic(tile)
+                # Pick the new shots of this sweep
+                candidates = []
+                for basic_info in tiles:
+                    if processed_count + len(candidates) >= max_shots:
+                        break
                     shot_id = basic_info.get("shot_id")
                     
                     # Skip if already processed or no shot_id
-                    if not shot_id or shot_id in processed_shots:
+                    if not shot_id:
                         continue
+                    key = shot_key(shot_id)
+                    if key in processed_shots or key in queued:
+                        continue
+                    queued.add(key)
+                    candidates.append((key, basic_info))
+                
+                # Fetch their details over HTTP in parallel
+                fetched = []
+                if candidates:
+                    print(f"Fetching details for {len(candidates)} shots...")
+                    fetched = loop.run_until_complete(fetch_details(
+                        async_client, [basic_info["shot_id"] for _, basic_info in candidates],
+                        max_concurrent=parallel_downloads,
+                    ))
+                
+                # Fall back to the modal, one at a time, where the endpoint did not give us an image;
+                # images are downloaded after the sweep
+                pending = []
+                for (key, basic_info), details in zip(candidates, fetched, strict=True):
+                    shot_id = basic_info["shot_id"]
+                    try:
+                        print(f"Processing shot {processed_count + 1}/{max_shots} (ID: {shot_id})")
+                        if isinstance(details, Exception):
+                            print(f"HTTP details fetch failed for {shot_id}: {details}")
+                            details = {}
+                        if not details.get("image_url"):
+                            open_shot_modal(driver, find_tile(driver, shot_id))
+                            details = parse_modal(driver)
+                            close_modal(driver)
                     
-                    print(f"Processing shot {processed_count + 1}/{max_shots} (ID: {shot_id})")
-                    
-                    # Process this tile
-                    open_shot_modal(driver, tile)
-                    details = parse_modal(driver)
-                    close_modal(driver)
-                    
-                    # Download image and get dimensions
-                    image_path, image_width, image_height, image_aspect_ratio_fraction, image_aspect_ratio_cinema = save_image(
-                        session, details.get("image_url", ""), img_dir, shot_id
-                    )
-                    
-                    # Create record with NEW column names (not modifying existing ones)
-                    record = {
-                        **basic_info, 
-                        **details, 
-                        "image_path": image_path,
-                        # New columns with different names
-                        "image_width": image_width,
-                        "image_height": image_height,
-                        "image_aspect_ratio_fraction": image_aspect_ratio_fraction,
-                        "image_aspect_ratio_cinema": image_aspect_ratio_cinema
-                    }
-                    rows.append(record)
-                    all_fields.update(record.keys())
-                    
-                    # Mark as processed
-                    processed_shots.add(shot_id)
-                    processed_count += 1
-                    new_tiles_processed += 1
-                    
-                    # Save progress periodically
-                    if processed_count % batch_size == 0:
-                        print(f"Processed {processed_count} shots, saving intermediate progress...")
-                        save_progress(rows, all_fields, str(base_output_dir / "shotdeck_progress_temp.xlsx"))
-                    
-                    human_pause(0.3, 0.7)
+                        record = {**basic_info, **details}
+                        pending.append((shot_id, details.get("image_url", ""), record))
+                        processed_count += 1
                     
-                except Exception as e:
-                    print(f"Error processing tile: {e}")
-                    continue
+                    except Exception as e:
+                        queued.discard(key)
+                        print(f"Error processing tile: {e}")
+                        continue
             
-            # Check if we found new tiles
-            if new_tiles_processed == 0:
-                consecutive_no_new += 1
-                print(f"No new tiles found ({consecutive_no_new}/{max_consecutive_no_new})")
-            else:
-                consecutive_no_new = 0
+                # Download images for this sweep in parallel
+                if pending:
+                    print(f"Downloading {len(pending)} images...")
+                    unsaved.extend(loop.run_until_complete(
+                        download_images(async_client, pending, img_dir, max_concurrent=parallel_downloads)
+                    ))
             
-            # Stop if no new tiles for a while or reached max
-            if consecutive_no_new >= max_consecutive_no_new or processed_count >= max_shots:
-                break
+                # Save progress periodically
+                if len(unsaved) >= batch_size:
+                    print(f"Processed {processed_count} shots, saving intermediate progress...")
+                    save_progress_incremental(unsaved, progress_path)
+                    processed_shots.update(shot_key(row["shot_id"]) for row in unsaved)
+                    # Keep the resume file in step with the progress file in case we get killed
+                    if processed_path is not None:
+                        save_processed(processed_shots, processed_path)
+                    unsaved = []
             
-            # Scroll down to load more content
-            print("Scrolling to load more content...")
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            human_pause(scroll_pause, scroll_pause * 2)
+                # Stop once we reached max; running out of tiles is detected after the scroll below
+                if processed_count >= max_shots:
+                    break
             
-            # Wait for new content to load
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                print("No more content to load")
-                break
-            last_height = new_height
+                # Scroll down to load more content
+                print("Scrolling to load more content...")
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
-        except Exception as e:
-            print(f"Error during incremental scrape: {e}")
-            break
+                # Wait until new tiles are appended rather than sleeping a fixed time
+                try:
+                    WebDriverWait(driver, scroll_timeout).until(lambda d, n=seen_tiles: count_tiles(d) > n)
+                except TimeoutException:
+                    print("No more content to load")
+                    break
+            
+            except Exception as e:
+                print(f"Error during incremental scrape: {e}")
+                break
     
+    finally:
+        # Don't lose the last partial batch
+        save_progress_incremental(unsaved, progress_path)
+        processed_shots.update(shot_key(row["shot_id"]) for row in unsaved)
+        if processed_path is not None:
+            save_processed(processed_shots, processed_path)
+        loop.run_until_complete(async_client.aclose())
+        loop.close()
+    
+    return processed_count
+
+def save_progress_incremental(rows_delta, path):
+    """Append only the newest rows to the progress file (JSON Lines)
+
+    Each shot can carry different modal fields, so rows are stored as JSON
+    objects rather than a fixed-schema table.
+    """
+    if not rows_delta:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows_delta:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    print(f"Progress saved: {len(rows_delta)} new rows to {path}")
+
+def load_progress(path):
+    """Read rows back from a progress file written by save_progress_incremental"""
+    rows = []
+    all_fields = set()
+    if not os.path.exists(path):
+        return rows, all_fields
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                rows.append(row)
+                all_fields.update(row.keys())
+    return rows, all_fields
+
+def merge_progress(paths):
+    """Concatenate the rows of several progress files, keeping the first row per shot
+
+    Browse URLs may overlap (e.g. two filters matching the same still), so the
+    same shot can appear in more than one shard.
+    """
+    rows = []
+    all_fields = set()
+    seen = set()
+    for path in paths:
+        shard_rows, shard_fields = load_progress(path)
+        for row in shard_rows:
+            shot_id = row.get("shot_id")
+            if shot_id in seen:
+                continue
+            seen.add(shot_id)
+            rows.append(row)
+        all_fields.update(shard_fields)
     return rows, all_fields
 
 def save_progress(rows, all_fields, filename):
-    """Save intermediate progress"""
+    """Write rows to an Excel file with a stable column order"""
     if not rows:
         return
         
@@ -447,20 +801,104 @@ def save_progress(rows, all_fields, filename):
     cols = cols + new_cols
     
     # Add dynamic columns from modal parsing (which may include existing aspect_ratio column)
-    dynamic = sorted([c for c in all_fields if c not in cols])
+    dynamic = sorted(set(all_fields) - set(cols))
     cols = cols + dynamic
 
     df = pd.DataFrame(rows)
-    for c in cols:
-        if c not in df.columns:
-            df[c] = ""
-    df = df[cols]
+    df = df.reindex(columns=cols, fill_value="")
+
+    # Aspect ratios for every row in one vectorised pass
+    widths = pd.to_numeric(df["image_width"], errors="coerce").fillna(0).to_numpy()
+    heights = pd.to_numeric(df["image_height"], errors="coerce").fillna(0).to_numpy()
+    df["image_aspect_ratio_fraction"], df["image_aspect_ratio_cinema"] = calculate_image_metadata_batch(widths, heights)
 
-    for c in df.columns:
-        df[c] = df[c].astype(str).str.replace(r"\s+\n\s+|\n", " ", regex=True).str.strip()
+    df = df.astype(str).replace(_NEWLINES, " ", regex=True)
+    df = df.apply(lambda s: s.str.strip())
 
     df.to_excel(filename, index=False)
-    print(f"Progress saved: {len(df)} rows to {filename}")
+    print(f"Saved {len(df)} rows to {filename}")
+
+def parse_browse_urls(value):
+    """Split SHOTDECK_BROWSE_URL into one browse URL per shard (whitespace separated)"""
+    return value.split() if value else []
+
+def progress_path_for(base_output_dir, shard_index, num_shards):
+    if num_shards <= 1:
+        return base_output_dir / "shotdeck_progress.jsonl"
+    return base_output_dir / f"shotdeck_shard_{shard_index}.jsonl"
+
+def scrape_shard(args, email, password, browse_url, base_output_dir, shard_index=0, num_shards=1):
+    """Scrape one browse URL (shard) in its own browser; returns the shard's progress file"""
+    progress_path = progress_path_for(base_output_dir, shard_index, num_shards)
+    processed_path = progress_path.with_suffix(".processed.pkl")
+
+    # Shards run one after another in the same process when --workers is 1,
+    # so don't let one shard's ids leak into the next shard's resume state
+    processed_shots.clear()
+
+    # Resume where an earlier run stopped, otherwise start with a fresh progress file
+    done = load_processed(processed_path)
+    if done:
+        print(f"Resuming: {len(done)} shots already processed (delete {processed_path} to start over)")
+        processed_shots.update(done)
+    elif progress_path.exists():
+        progress_path.unlink()
+
+    # Split the shot budget evenly across shards
+    max_shots = -(-args.max_shots // num_shards)
+    shard_label = f"[shard {shard_index + 1}/{num_shards}] " if num_shards > 1 else ""
+
+    driver = attach_session() if args.reuse_session else None
+    reattached = driver is not None
+    if reattached:
+        print(f"{shard_label}Reattached to saved browser session, skipping login")
+    else:
+        driver = setup_driver(headless=args.headless)
+    try:
+        if not reattached:
+            print(f"{shard_label}Logging in...")
+            selenium_login(driver, email, password)
+            if args.reuse_session:
+                save_session(driver)
+                print(f"{shard_label}Browser session saved to {SESSION_FILE}")
+        
+        def open_browse_page():
+            print(f"{shard_label}Navigating to browse page: {browse_url}")
+            driver.get(browse_url)
+            WebDriverWait(driver, args.timeout).until(
+                lambda d: d.execute_script("return document.readyState") in ("interactive", "complete")
+            )
+
+        open_browse_page()
+        # The browser may still be alive while its Shotdeck login has expired
+        if reattached and is_logged_out(driver):
+            print(f"{shard_label}Saved session is logged out, logging in again...")
+            selenium_login(driver, email, password)
+            open_browse_page()
+        
+        print(f"{shard_label}Waiting for gallery to load...")
+        wait_for_gallery(driver, timeout=args.timeout, max_retries=args.retries)
+
+        client = copy_cookies_to_client(driver)
+        
+        # Create full paths relative to base output directory
+        img_dir = base_output_dir / args.images_dir
+        
+        print(f"{shard_label}Images will be saved to: {img_dir}")
+        print(f"{shard_label}Progress will be saved to: {progress_path}")
+
+        # Incremental scraping
+        with client:
+            incremental_scrape(
+                driver, client, max_shots, img_dir, progress_path,
+                batch_size=args.batch_size, scroll_timeout=args.scroll_timeout,
+                parallel_downloads=args.parallel_downloads, processed_path=processed_path
+            )
+    finally:
+        # A reusable session stays open for the next run
+        if not args.reuse_session:
+            driver.quit()
+    return progress_path
 
 def main():
     ap = argparse.ArgumentParser()
@@ -471,22 +909,39 @@ def main():
     ap.add_argument("--timeout", type=int, default=60, help="Timeout for page loading in seconds")
     ap.add_argument("--retries", type=int, default=3, help="Number of retries for loading")
     ap.add_argument("--batch-size", type=int, default=50, help="Save progress every X items")
-    ap.add_argument("--scroll-pause", type=float, default=2.0, help="Pause between scrolls")
+    ap.add_argument("--scroll-timeout", type=float, default=10.0, help="Max seconds to wait for new tiles after scrolling")
+    ap.add_argument("--parallel-downloads", type=int, default=16, help="Max concurrent detail fetches and image downloads")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Number of browser processes; each scrapes one of the browse URLs in SHOTDECK_BROWSE_URL")
+    ap.add_argument("--shard-index", type=int, default=None, help="Only scrape this browse URL (0-based)")
+    ap.add_argument("--reuse-session", action="store_true",
+                    help="Reattach to the browser left open by a previous --reuse-session run, skipping startup and login")
     args = ap.parse_args()
 
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+
     load_dotenv()
     email = os.getenv("SHOTDECK_EMAIL")
     password = os.getenv("SHOTDECK_PASSWORD")
-    browse_url = os.getenv("SHOTDECK_BROWSE_URL")
+    browse_urls = parse_browse_urls(os.getenv("SHOTDECK_BROWSE_URL"))
     output_base_dir = os.getenv("SHOTDECK_OUTPUT_DIR")
     
     if not email or not password:
         raise SystemExit("Please set SHOTDECK_EMAIL and SHOTDECK_PASSWORD in a .env file")
     
-    if not browse_url:
+    if not browse_urls:
         # Default browse URL if not specified in .env
-        browse_url = "https://shotdeck.com/browse/stills"
-        print(f"SHOTDECK_BROWSE_URL not set in .env, using default: {browse_url}")
+        browse_urls = ["https://shotdeck.com/browse/stills"]
+        print(f"SHOTDECK_BROWSE_URL not set in .env, using default: {browse_urls[0]}")
+
+    # Each browse URL is one shard, scraped by its own browser
+    num_shards = len(browse_urls)
+    if args.shard_index is not None and not 0 <= args.shard_index < num_shards:
+        raise SystemExit(f"--shard-index must be between 0 and {num_shards - 1}")
+    shards = [args.shard_index] if args.shard_index is not None else list(range(num_shards))
+    if args.reuse_session and len(shards) > 1:
+        raise SystemExit("--reuse-session can only be used with a single browse URL")
     
     # Set up base output directory
     if output_base_dir:
@@ -497,47 +952,32 @@ def main():
         base_output_dir = Path.cwd()
         print(f"SHOTDECK_OUTPUT_DIR not set in .env, using current directory: {base_output_dir}")
 
-    driver = setup_driver(headless=args.headless)
-    try:
-        print("Logging in...")
-        selenium_login(driver, email, password)
-        
-        print(f"Navigating to browse page: {browse_url}")
-        driver.get(browse_url)
-        
-        WebDriverWait(driver, args.timeout).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        
-        print("Waiting for gallery to load...")
-        wait_for_gallery(driver, timeout=args.timeout, max_retries=args.retries)
-
-        session = copy_cookies_to_requests(driver)
-        
-        # Create full paths relative to base output directory
-        img_dir = base_output_dir / args.images_dir
-        out_xlsx = base_output_dir / args.out_xlsx
-        
-        print(f"Images will be saved to: {img_dir}")
-        print(f"Excel file will be saved to: {out_xlsx}")
-
-        # Incremental scraping
-        rows, all_fields = incremental_scrape(
-            driver, session, args.max_shots, img_dir, 
-            batch_size=args.batch_size, scroll_pause=args.scroll_pause
-        )
+    out_xlsx = base_output_dir / args.out_xlsx
+    print(f"Excel file will be saved to: {out_xlsx}")
+    progress_paths = [progress_path_for(base_output_dir, k, num_shards) for k in shards]
 
-        # Final save
+    try:
+        jobs = [(args, email, password, browse_urls[k], base_output_dir, k, num_shards) for k in shards]
+        workers = min(args.workers, len(jobs))
+        if workers > 1:
+            # Selenium drivers are not thread-safe, so each shard gets its own process and browser
+            with multiprocessing.Pool(workers) as pool:
+                pool.starmap(scrape_shard, jobs)
+        else:
+            for job in jobs:
+                scrape_shard(*job)
+
+        # Final save: the Excel file is only written once, from the progress files
+        rows, all_fields = merge_progress(progress_paths)
         save_progress(rows, all_fields, str(out_xlsx))
         print(f"Final results: Saved {len(rows)} rows to {out_xlsx}")
         
     except Exception as e:
         print(f"Error occurred: {e}")
         # Try to save progress even if error occurs
-        if 'rows' in locals() and 'all_fields' in locals():
-            error_backup = base_output_dir / f"shotdeck_error_backup.xlsx"
+        rows, all_fields = merge_progress(progress_paths)
+        if rows:
+            error_backup = base_output_dir / "shotdeck_error_backup.xlsx"
             save_progress(rows, all_fields, str(error_backup))
             print(f"Error backup saved to: {error_backup}")
         raise
-    finally:
-        driver.quit()
@@ -1,4 +1,26 @@
-from shotdeck_scraper.scraper import calculate_image_metadata
+import asyncio
+import io
+
+import httpx
+import lxml.html
+import pytest
+from PIL import Image
+
+from shotdeck_scraper import scraper
+from shotdeck_scraper.scraper import (
+    calculate_image_metadata,
+    calculate_image_metadata_batch,
+    incremental_scrape,
+    load_processed,
+    load_progress,
+    merge_progress,
+    parse_browse_urls,
+    parse_shot_details,
+    parse_tile_basic,
+    save_image,
+    save_processed,
+    save_progress_incremental,
+)
 
 
 def test_calculate_image_metadata_square():
@@ -6,3 +28,176 @@ def test_calculate_image_metadata_square():
     assert meta["image_width"] == 1000
     assert meta["image_height"] == 1000
     assert meta["image_aspect_ratio_fraction"] == "1:1"
+    assert meta["image_aspect_ratio_cinema"] == "1:1"
+
+
+def test_calculate_image_metadata_cinema_ratio():
+    assert calculate_image_metadata(1920, 1080)["image_aspect_ratio_cinema"] == "16:9"
+    assert calculate_image_metadata(1920, 800)["image_aspect_ratio_cinema"] == "2.39:1"
+    assert calculate_image_metadata(3000, 1000)["image_aspect_ratio_cinema"] == "3.00:1"
+    assert calculate_image_metadata(0, 1000)["image_aspect_ratio_fraction"] == ""
+
+
+def test_parse_shot_details():
+    tree = lxml.html.fromstring(
+        """
+        <div>
+          <h4 id="shotModalTitle">Heat  (1995)</h4>
+          <div class="palette">
+            <a style="background-color: #112233;"></a>
+            <a style="background-color: #445566;"></a>
+          </div>
+          <div id="shot_details">
+            <div class="detail-group">
+              <p class="detail-type">Shot Type:</p>
+              <div class="details"><a>Wide</a><a>Medium</a></div>
+            </div>
+            <div class="detail-group">
+              <p class="detail-type">Lens Size</p>
+              <div class="details">Long Lens</div>
+            </div>
+          </div>
+          <div id="hero"><a href="/assets/images/stills/abc.jpg">img</a></div>
+        </div>
+        """
+    )
+    data = parse_shot_details(tree)
+    assert data["title_year_raw"] == "Heat (1995)"
+    assert data["palette_hex"] == "#112233,#445566"
+    assert data["shot_type"] == "Wide, Medium"
+    assert data["lens_size"] == "Long Lens"
+    assert data["image_url"] == "https://shotdeck.com/assets/images/stills/abc.jpg"
+
+
+def test_progress_roundtrip(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    save_progress_incremental([{"shot_id": "1", "lens_size": "Long"}], path)
+    save_progress_incremental([{"shot_id": "2", "shot_type": "Wide"}], path)
+    rows, all_fields = load_progress(path)
+    assert [r["shot_id"] for r in rows] == ["1", "2"]
+    assert all_fields == {"shot_id", "lens_size", "shot_type"}
+
+
+def test_merge_progress_drops_duplicate_shots(tmp_path):
+    first, second = tmp_path / "shard_0.jsonl", tmp_path / "shard_1.jsonl"
+    save_progress_incremental([{"shot_id": "1"}, {"shot_id": "2"}], first)
+    save_progress_incremental([{"shot_id": "2", "lens_size": "Long"}, {"shot_id": "3"}], second)
+    rows, all_fields = merge_progress([first, second])
+    assert [r["shot_id"] for r in rows] == ["1", "2", "3"]
+    assert all_fields == {"shot_id", "lens_size"}
+
+
+def test_parse_browse_urls():
+    assert parse_browse_urls(None) == []
+    assert parse_browse_urls("https://a/x?f=1,2\n  https://a/y") == ["https://a/x?f=1,2", "https://a/y"]
+
+
+def test_parse_tile_basic():
+    tile = lxml.html.fragment_fromstring(
+        """
+        <div class="outerimage" data-shotid="123" data-titleyear="Heat (1995)"
+             data-shot-status="1" data-title-content-status="2">
+          <a class="gallerythumb" data-filename="abc.jpg">
+            <img class="still" src="/assets/img/thumb.jpg">
+          </a>
+          <div class="moviedetails topdetails"><span class="gallerytitle"> Heat
+            (1995) </span></div>
+        </div>
+        """
+    )
+    d = parse_tile_basic(tile)
+    assert d["shot_id"] == "123"
+    assert d["shot_status"] == "1"
+    assert d["title_content_status"] == "2"
+    assert d["grid_title_raw"] == "Heat (1995)"
+    assert d["thumb_src"] == "https://shotdeck.com/assets/img/thumb.jpg"
+    assert d["data_filename"] == "abc.jpg"
+
+
+def test_calculate_image_metadata_batch_matches_scalar():
+    sizes = [(1000, 1000), (1920, 1080), (1920, 800), (3000, 1000), (640, 480), (0, 480)]
+    fractions, cinemas = calculate_image_metadata_batch([w for w, _ in sizes], [h for _, h in sizes])
+    for (w, h), fraction, cinema in zip(sizes, fractions, cinemas, strict=True):
+        meta = calculate_image_metadata(w, h)
+        assert fraction == meta["image_aspect_ratio_fraction"]
+        assert cinema == meta["image_aspect_ratio_cinema"]
+
+
+def test_processed_roundtrip(tmp_path):
+    path = tmp_path / "progress.processed.pkl"
+    assert load_processed(path) == set()
+    save_processed({1, 22, 333}, path)
+    assert load_processed(path) == {1, 22, 333}
+
+
+class _FakeDriver:
+    def execute_script(self, script, *args):
+        return None
+
+
+class _FakeAsyncClient:
+    async def aclose(self):
+        pass
+
+
+def test_incremental_scrape_resumes_after_interrupt(tmp_path, monkeypatch):
+    tiles = [{"shot_id": shot_id} for shot_id in ("1", "2", "3", "abc")]
+    progress_path = tmp_path / "progress.jsonl"
+    processed_path = tmp_path / "progress.processed.pkl"
+    interrupt_on = {"3"}
+    # What a hard kill at the interrupt would leave behind (the finally block never runs then)
+    resume_at_interrupt = []
+
+    async def fetch_shot_details(client, shot_id):
+        if shot_id in interrupt_on:
+            resume_at_interrupt.append(load_processed(processed_path))
+            raise KeyboardInterrupt
+        return {"image_url": f"https://example.com/{shot_id}.jpg"}
+
+    async def download_images(client, pending, img_dir, max_concurrent=16):
+        return [record for _, _, record in pending]
+
+    monkeypatch.setattr(scraper, "harvest_tiles", lambda driver, start=0: tiles[start:start + 2])
+    monkeypatch.setattr(scraper, "count_tiles", lambda driver: len(tiles))
+    monkeypatch.setattr(scraper, "fetch_shot_details", fetch_shot_details)
+    monkeypatch.setattr(scraper, "download_images", download_images)
+    monkeypatch.setattr(scraper, "async_client_like", lambda client, max_connections=64: _FakeAsyncClient())
+    monkeypatch.setattr(scraper, "processed_shots", set())
+
+    def run():
+        return incremental_scrape(_FakeDriver(), None, 10, tmp_path, progress_path, batch_size=2,
+                                  scroll_timeout=0, processed_path=processed_path)
+
+    # Interrupted in the second sweep: only the saved first sweep counts as processed
+    with pytest.raises(KeyboardInterrupt):
+        run()
+    assert resume_at_interrupt == [{1, 2}]
+    assert load_processed(processed_path) == {1, 2}
+    assert [row["shot_id"] for row in load_progress(progress_path)[0]] == ["1", "2"]
+
+    # Resume: the interrupted shot is picked up again, nothing is written twice
+    interrupt_on.clear()
+    scraper.processed_shots.clear()
+    scraper.processed_shots.update(load_processed(processed_path))
+    assert run() == 2
+    assert load_processed(processed_path) == {1, 2, 3, "abc"}
+    assert [row["shot_id"] for row in load_progress(progress_path)[0]] == ["1", "2", "3", "abc"]
+
+
+def test_save_image_same_shot_from_two_writers(tmp_path):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 27)).save(buf, "JPEG")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=buf.getvalue()))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            # Each writer needs its own temp file even though both target 42.jpg
+            return await asyncio.gather(
+                save_image(client, "https://example.com/42.jpg", tmp_path, "42"),
+                save_image(client, "https://example.com/42.jpg", tmp_path, "42"),
+            )
+
+    for meta in asyncio.run(run()):
+        assert meta.path == str(tmp_path / "42.jpg")
+        assert (meta.width, meta.height) == ("64", "27")
+    assert [p.name for p in tmp_path.iterdir()] == ["42.jpg"]